@@ -1,51 +1,82 @@
 import machine
+import micropython
+from micropython import const
 import utime
 import math
 
-CONFIG_WAIT_MS = 10
+# Settle time after writing a shadow register
+CONFIG_WAIT_MS = const(10)
+# Settle time after a volatile-only write. Kept at the original wait until a
+# datasheet figure for the register update time is available.
+VOLATILE_WAIT_MS = const(10)
+
+# Volts per ADC count for a 3.3 V reference
+_ADC_SCALE = 3.3 / 65536
+
+# Fine gain and offset step per code
+_FG_SCALE = 0.125 / 100.0
+_OFF_SCALE = 0.0015 / 100.0
 
 
 def read_adc_voltage(adc: machine.ADC, vdd: float = 3.3):
     return adc.read_u16() / 65536 * vdd
 
 
-def most_significant_one(n: int) -> int:
-    i = 1
-    while (n >> i) != 0:
-        i += 1
-    return i
+@micropython.native
+def _sum_diff(adc: machine.ADC, ref: machine.ADC, nsamples: int, delay_ms: int) -> int:
+    s = 0
+    for _ in range(nsamples):
+        s += adc.read_u16() - ref.read_u16()
+        utime.sleep_ms(delay_ms)
+    return s
 
 
-def least_significant_one(n: int) -> int:
-    if n == 0:
-        return 0
-    i = 0
-    while ((n >> i) & 0b1) != 1:
+@micropython.viper
+def _crc_kernel(word: uint, polynomial: uint, filler: uint) -> uint:
+    g = uint(0)
+    while polynomial >> g:
+        g += 1
+    n = g - 1
+    word = (word << n) | filler
+    i = uint(0)
+    while word >> i:
         i += 1
-    return i
+    while i > n:
+        if (word >> (i - 1)) & 0b1:
+            word ^= polynomial << (i - g)
+        i -= 1
+
+    return word
 
 
 def crc(word: int, polynomial: int, filler: int = 0) -> int:
-    g = most_significant_one(polynomial)
-    n = g - 1
-    word = (word << n) | filler
-    while (word >> n) != 0:
-        first_one = most_significant_one(word)
-        xor_mask = ~(0xFF << g) << (first_one - g)
-        xor_val = polynomial << (first_one - g)
-        word = ((word & xor_mask) ^ xor_val) | (word & ~xor_mask)
+    return _crc_kernel(word, polynomial, filler)
+
+
+CRC_POLYNOMIAL = 0b1011
+
+# Remainder of every byte followed by three zero bits. The 3-bit remainder is
+# folded into the top of the next byte, so a word is reduced one byte at a time
+_CRC_TABLE = bytes(crc(i, CRC_POLYNOMIAL) for i in range(256))
 
-    return word & ~(0xFF << g)
 
+@micropython.native
+def fast_crc(word: int, filler: int = 0) -> int:
+    # Words are at most 24 bits wide (7-bit address + 11-bit value on write)
+    rem = _CRC_TABLE[(word >> 16) & 0xFF]
+    rem = _CRC_TABLE[(rem << 5) ^ ((word >> 8) & 0xFF)]
+    rem = _CRC_TABLE[(rem << 5) ^ (word & 0xFF)]
+    return rem ^ filler
 
-VDD_3V3 = 0
-VDD_5V0 = 1
 
-OM_DIFFERENTIAL = 0
-OM_SINGLE_ENDED = 1
+VDD_3V3 = const(0)
+VDD_5V0 = const(1)
+
+OM_DIFFERENTIAL = const(0)
+OM_SINGLE_ENDED = const(1)
 
 # fmt: off
-GAIN_FACTORS = [2.0, 2.1, 2.18, 2.29, 2.38, 2.5, 2.59, 2.72, 2.83, 2.97,
+GAIN_FACTORS = (2.0, 2.1, 2.18, 2.29, 2.38, 2.5, 2.59, 2.72, 2.83, 2.97,
                 3.09, 3.24, 3.36, 3.53, 3.67, 3.85, 4.0, 4.2, 4.36, 4.58,
                 4.76, 4.99, 5.19, 5.45, 5.66, 5.94, 6.17, 6.48, 6.73, 7.06,
                 7.34, 7.7, 8.0, 8.4, 8.72, 9.16, 9.51, 9.99, 10.38, 10.89,
@@ -54,9 +85,66 @@ GAIN_FACTORS = [2.0, 2.1, 2.18, 2.29, 2.38, 2.5, 2.59, 2.72, 2.83, 2.97,
                 26.91, 28.26, 29.34, 30.81, 32.0, 33.6, 34.9, 36.64, 38.05, 39.95,
                 41.5, 43.58, 45.25, 47.51, 49.36, 51.83, 53.82, 56.52, 58.69, 61.62,
                 64.0, 67.2, 69.79, 73.28, 76.1, 79.9, 83.01, 87.16, 90.5, 95.02,
-                98.72, 103.66, 107.65, 113.03, 117.38, 123.24]
+                98.72, 103.66, 107.65, 113.03, 117.38, 123.24)
 # fmt: on
 
+# Register fields as (address, shift, width mask)
+F_OUTPUT_MODE = (0x00, 1, 0b1)
+F_SUB_ADDR = (0x00, 4, 0x0F)
+F_AUTOMATIC_GAIN_CONTROL = (0x00, 9, 0b1)
+F_VDD = (0x01, 0, 0b1)
+F_MASTER_GAIN = (0x02, 0, 0x7F)
+F_MASTER_GAIN_BOOST = (0x02, 7, 0b1)
+F_FINE_GAIN_1 = (0x03, 0, 0x7F)
+F_OFFSET_1 = (0x04, 0, 0xFF)
+F_OFFSET_CODE_1 = (0x04, 0, 0x7F)
+F_OFFSET_SIGN_1 = (0x04, 7, 0b1)
+F_FINE_GAIN_2 = (0x05, 0, 0x7F)
+F_OFFSET_2 = (0x06, 0, 0xFF)
+F_OFFSET_CODE_2 = (0x06, 0, 0x7F)
+F_OFFSET_SIGN_2 = (0x06, 7, 0b1)
+F_CURRENT_BIAS = (0x07, 0, 0xFF)
+F_TX_FREQUENCY = (0x6E, 0, 0x7FF)
+
+# Registers the chip can change on its own (the master gain, under automatic
+# gain control); masked writes always read these back from the device
+_UNCACHED_REGS = (F_MASTER_GAIN[0], F_MASTER_GAIN[0] | 0x40)
+
+
+def decode_field(reg: int, field) -> int:
+    _, shift, mask = field
+    return (reg >> shift) & mask
+
+
+def encode_field(reg: int, field, value: int) -> int:
+    _, shift, mask = field
+    return (reg & ~(mask << shift)) | ((value & mask) << shift)
+
+
+def _decode_master_gain(reg: int) -> float:
+    gain = GAIN_FACTORS[decode_field(reg, F_MASTER_GAIN)]
+    if decode_field(reg, F_MASTER_GAIN_BOOST):
+        gain *= 2
+    return gain
+
+
+def tx_frequency(code: int) -> float:
+    return code * 20000.0
+
+
+def fine_gain(code: int) -> float:
+    return 1.0 + code * _FG_SCALE
+
+
+def offset_perc(sign: int, code: int) -> float:
+    return sign * code * _OFF_SCALE
+
+
+def current_bias_uA(code: int) -> float:
+    multiplier = 1 << ((code >> 6) * 2)
+    base = code & 0x003F
+    return multiplier * base * 0.5
+
 
 class IPS:
     _i2c_addr: int
@@ -64,6 +152,11 @@ class IPS:
     _rx1: machine.ADC
     _rx2: machine.ADC
     _ref: machine.ADC
+    _tx_buf: bytearray
+    _rx_buf: bytearray
+    _frame_a: bytearray
+    _frame_b: bytearray
+    _reg_cache: dict
 
     def __init__(
         self,
@@ -81,220 +174,281 @@ class IPS:
         self._rx2 = machine.ADC(rx2)
         self._ref = machine.ADC(ref)
         self._i2c_addr = i2c_addr
+        self._tx_buf = bytearray(2)
+        self._rx_buf = bytearray(2)
+        self._frame_a = bytearray(3)
+        self._frame_b = bytearray(3)
+        self._reg_cache = {}
 
+    @micropython.native
     def read_register(self, reg_addr):
-        data = self._i2c.readfrom_mem(self._i2c_addr, reg_addr, 2)
-        data = (data[0] << 8) | data[1]
+        self._i2c.readfrom_mem_into(self._i2c_addr, reg_addr, self._rx_buf)
+        data = (self._rx_buf[0] << 8) | self._rx_buf[1]
         crc_bits = data & 0b111
         reg = data >> 5
 
         message = ((reg << 5) & 0xFF00) | (reg & 0b111)
-        if crc(message, 0b1011, crc_bits) != 0:
+        if fast_crc(message, crc_bits) != 0:
             raise AssertionError("CRC check failed on read")
 
+        self._reg_cache[reg_addr] = reg
+        return reg
+
+    def _cached_read(self, reg_addr):
+        if reg_addr in _UNCACHED_REGS:
+            return self.read_register(reg_addr)
+        reg = self._reg_cache.get(reg_addr)
+        if reg is None:
+            reg = self.read_register(reg_addr)
         return reg
 
+    def reset_cache(self):
+        # Call after power-cycling the sensor, as the cached values go stale
+        self._reg_cache = {}
+
     def read_register_masked(self, reg_addr, mask):
         reg = self.read_register(reg_addr)
-        return (reg & mask) >> least_significant_one(mask)
+        if mask == 0:
+            return 0
+        # mask & -mask isolates the lowest set bit of the mask
+        return (reg & mask) // (mask & -mask)
 
-    def write_register(self, reg_addr, value):
+    @micropython.native
+    def _get_field(self, field) -> int:
+        return decode_field(self.read_register(field[0]), field)
+
+    def snapshot(self, reg_addrs) -> dict:
+        return {reg_addr: self.read_register(reg_addr) for reg_addr in reg_addrs}
+
+    def _encode(self, reg_addr, value) -> int:
         crc_in = (
             ((reg_addr & 0x007F) << 17) | ((value & 0x07F8) << 5) | (value & 0x0007)
         )
-        crc_bits = crc(crc_in, 0b1011)
-        message = (value << 5) | 0x18 | crc_bits
-        self._i2c.writeto_mem(self._i2c_addr, reg_addr, message.to_bytes(2, "big"))
+        crc_bits = fast_crc(crc_in)
+        return (value << 5) | 0x18 | crc_bits
+
+    def write_register(self, reg_addr, value):
+        message = self._encode(reg_addr, value)
+        self._tx_buf[0] = message >> 8
+        self._tx_buf[1] = message & 0xFF
+        try:
+            self._i2c.writeto_mem(self._i2c_addr, reg_addr, self._tx_buf)
+        except OSError:
+            self._reg_cache.pop(reg_addr, None)
+            raise
+        self._reg_cache[reg_addr] = value
 
     def write_register_masked(self, reg_addr, value, mask):
-        reg = self.read_register(reg_addr)
+        reg = self._cached_read(reg_addr)
         updated_reg = (reg & ~mask) | (value & mask)
         self.write_register(reg_addr, updated_reg)
 
+    def _write_pair(self, reg_a, value_a, reg_b, value_b):
+        # Both frames go out in one bus transaction: the first write skips the
+        # stop condition, so the second one starts with a repeated start.
+        message_a = self._encode(reg_a, value_a)
+        message_b = self._encode(reg_b, value_b)
+        frame_a = self._frame_a
+        frame_a[0] = reg_a
+        frame_a[1] = message_a >> 8
+        frame_a[2] = message_a & 0xFF
+        frame_b = self._frame_b
+        frame_b[0] = reg_b
+        frame_b[1] = message_b >> 8
+        frame_b[2] = message_b & 0xFF
+        try:
+            self._i2c.writeto(self._i2c_addr, frame_a, False)
+            self._i2c.writeto(self._i2c_addr, frame_b)
+        except OSError:
+            # never leave the cache describing a half-applied pair
+            self._reg_cache.pop(reg_a, None)
+            self._reg_cache.pop(reg_b, None)
+            raise
+        self._reg_cache[reg_a] = value_a
+        self._reg_cache[reg_b] = value_b
+
+    def _write_pair_masked(self, reg_a, reg_b, value, mask):
+        reg_a_val = self._cached_read(reg_a)
+        reg_b_val = self._cached_read(reg_b)
+        self._write_pair(
+            reg_a,
+            (reg_a_val & ~mask) | (value & mask),
+            reg_b,
+            (reg_b_val & ~mask) | (value & mask),
+        )
+
+    def _write_config(self, field, value, persistent):
+        reg_addr, shift, mask = field
+        value <<= shift
+        mask <<= shift
+        if persistent:
+            # shadow registers mirror the live ones at reg_addr + 0x40
+            self._write_pair_masked(reg_addr | 0x40, reg_addr, value, mask)
+            utime.sleep_ms(CONFIG_WAIT_MS)
+        else:
+            self.write_register_masked(reg_addr, value, mask)
+            utime.sleep_ms(VOLATILE_WAIT_MS)
+
     def set_sub_addr(self, msn):
-        self.write_register_masked(0x40, msn << 4, 0x00F0)
-        self.write_register_masked(0x00, msn << 4, 0x00F0)
-        utime.sleep_ms(CONFIG_WAIT_MS)
+        self._write_config(F_SUB_ADDR, msn, True)
         print("The value will change at next power-up.")
 
-    def set_voltage(self, vdd: int):
+    def set_voltage(self, vdd: int, persistent: bool = False):
         if vdd != VDD_3V3 and vdd != VDD_5V0:
             raise RuntimeError
-        self.write_register_masked(0x41, vdd, 0b1)
-        self.write_register_masked(0x01, vdd, 0b1)
-        utime.sleep_ms(CONFIG_WAIT_MS)
+        self._write_config(F_VDD, vdd, persistent)
 
-    def set_automatic_gain_control(self, enabled: bool):
+    def set_automatic_gain_control(self, enabled: bool, persistent: bool = False):
         val = 0 if enabled else 1
-        self.write_register_masked(0x40, val << 9, 0b1 << 9)
-        self.write_register_masked(0x00, val << 9, 0b1 << 9)
-        utime.sleep_ms(CONFIG_WAIT_MS)
+        self._write_config(F_AUTOMATIC_GAIN_CONTROL, val, persistent)
 
-    def set_master_gain_boost(self, enabled: bool):
+    def set_master_gain_boost(self, enabled: bool, persistent: bool = False):
         val = 1 if enabled else 0
-        self.write_register_masked(0x42, val << 7, 0b1 << 7)
-        self.write_register_masked(0x02, val << 7, 0b1 << 7)
-        utime.sleep_ms(CONFIG_WAIT_MS)
+        self._write_config(F_MASTER_GAIN_BOOST, val, persistent)
 
-    def set_master_gain_code(self, code: int):
+    def set_master_gain_code(self, code: int, persistent: bool = False):
         if code > 95 or code < 0:
             raise RuntimeError
-        self.write_register_masked(0x42, code, 0x007F)
-        self.write_register_masked(0x02, code, 0x007F)
-        utime.sleep_ms(CONFIG_WAIT_MS)
+        self._write_config(F_MASTER_GAIN, code, persistent)
 
-    def set_fine_gain_1(self, code: int):
+    def set_fine_gain_1(self, code: int, persistent: bool = False):
         if code > 0x7F or code < 0:
             raise RuntimeError
-        self.write_register_masked(0x43, code, 0x007F)
-        self.write_register_masked(0x03, code, 0x007F)
-        utime.sleep_ms(CONFIG_WAIT_MS)
+        self._write_config(F_FINE_GAIN_1, code, persistent)
 
-    def set_fine_gain_2(self, code: int):
+    def set_fine_gain_2(self, code: int, persistent: bool = False):
         if code > 0x7F or code < 0:
             raise RuntimeError
-        self.write_register_masked(0x45, code, 0x007F)
-        self.write_register_masked(0x05, code, 0x007F)
-        utime.sleep_ms(CONFIG_WAIT_MS)
+        self._write_config(F_FINE_GAIN_2, code, persistent)
 
-    def set_offset_1(self, sign: int, code: int):
+    def set_offset_1(self, sign: int, code: int, persistent: bool = False):
         if code > 0x7F or code < 0:
             raise RuntimeError
-        sign_code = (1 if sign < 0 else 0) << 7
-        self.write_register_masked(0x44, sign_code | code, 0x00FF)
-        self.write_register_masked(0x04, sign_code | code, 0x00FF)
-        utime.sleep_ms(CONFIG_WAIT_MS)
+        offset = encode_field(code, F_OFFSET_SIGN_1, 1 if sign < 0 else 0)
+        self._write_config(F_OFFSET_1, offset, persistent)
 
-    def set_offset_2(self, sign: int, code: int):
+    def set_offset_2(self, sign: int, code: int, persistent: bool = False):
         if code > 0x7F or code < 0:
             raise RuntimeError
-        sign_code = (1 if sign < 0 else 0) << 7
-        self.write_register_masked(0x46, sign_code | code, 0x00FF)
-        self.write_register_masked(0x06, sign_code | code, 0x00FF)
-        utime.sleep_ms(CONFIG_WAIT_MS)
+        offset = encode_field(code, F_OFFSET_SIGN_2, 1 if sign < 0 else 0)
+        self._write_config(F_OFFSET_2, offset, persistent)
 
-    def set_current_bias(self, code: int):
+    def set_current_bias(self, code: int, persistent: bool = False):
         if code < 0 or code > 0xFF:
             raise RuntimeError
-        self.write_register_masked(0x47, code, 0x00FF)
-        self.write_register_masked(0x07, code, 0x00FF)
-        utime.sleep_ms(CONFIG_WAIT_MS)
+        self._write_config(F_CURRENT_BIAS, code, persistent)
 
-    def set_output_mode(self, mode: int):
+    def set_output_mode(self, mode: int, persistent: bool = False):
         if mode != OM_DIFFERENTIAL and mode != OM_SINGLE_ENDED:
             raise RuntimeError
-        self.write_register_masked(0x40, mode << 1, 0b1 << 1)
-        self.write_register_masked(0x00, mode << 1, 0b1 << 1)
-        utime.sleep_ms(CONFIG_WAIT_MS)
+        self._write_config(F_OUTPUT_MODE, mode, persistent)
 
     def get_tx_frequency(self) -> float:
-        return self.read_register_masked(0x6E, 0x07FF) * 20000.0
+        return tx_frequency(self._get_field(F_TX_FREQUENCY))
 
     def get_vdd(self) -> float:
-        code = self.read_register_masked(0x01, 0b1)
+        code = self._get_field(F_VDD)
         return VDD_3V3 if code == 0 else VDD_5V0
 
     def get_output_mode(self) -> int:
-        code = self.read_register_masked(0x00, 0b1 << 1)
+        code = self._get_field(F_OUTPUT_MODE)
         return OM_DIFFERENTIAL if code == 0 else OM_SINGLE_ENDED
 
     def get_automatic_gain_control(self) -> bool:
-        return self.read_register_masked(0x00, 0b1 << 9) == 0
+        return self._get_field(F_AUTOMATIC_GAIN_CONTROL) == 0
 
     def get_master_gain_code(self) -> int:
-        return self.read_register_masked(0x02, 0x007F)
+        return self._get_field(F_MASTER_GAIN)
 
     def get_master_gain(self) -> float:
         return GAIN_FACTORS[self.get_master_gain_code()]
 
     def get_master_gain_boost(self) -> bool:
-        return self.read_register_masked(0x02, 0b1 << 7) == 1
+        return self._get_field(F_MASTER_GAIN_BOOST) == 1
 
     def get_fine_gain_1_code(self) -> int:
-        return self.read_register_masked(0x03, 0x007F)
+        return self._get_field(F_FINE_GAIN_1)
 
     def get_fine_gain_2_code(self) -> int:
-        return self.read_register_masked(0x05, 0x007F)
+        return self._get_field(F_FINE_GAIN_2)
 
     def get_fine_gain_1(self) -> float:
-        return 1.0 + self.get_fine_gain_1_code() * 0.125 / 100.0
+        return fine_gain(self.get_fine_gain_1_code())
 
     def get_fine_gain_2(self) -> float:
-        return 1.0 + self.get_fine_gain_2_code() * 0.125 / 100.0
+        return fine_gain(self.get_fine_gain_2_code())
 
     def get_offset_sign_1(self) -> int:
-        return 1 if self.read_register_masked(0x04, 0b1 << 7) == 0 else -1
+        return 1 if self._get_field(F_OFFSET_SIGN_1) == 0 else -1
 
     def get_offset_sign_2(self) -> int:
-        return 1 if self.read_register_masked(0x06, 0b1 << 7) == 0 else -1
+        return 1 if self._get_field(F_OFFSET_SIGN_2) == 0 else -1
 
     def get_offset_code_1(self) -> int:
-        return self.read_register_masked(0x04, 0x007F)
+        return self._get_field(F_OFFSET_CODE_1)
 
     def get_offset_code_2(self) -> int:
-        return self.read_register_masked(0x06, 0x007F)
+        return self._get_field(F_OFFSET_CODE_2)
 
     def get_offset_1_perc(self) -> float:
-        return self.get_offset_sign_1() * self.get_offset_code_1() * 0.0015 / 100.0
+        return offset_perc(self.get_offset_sign_1(), self.get_offset_code_1())
 
     def get_offset_2_perc(self) -> float:
-        return self.get_offset_sign_2() * self.get_offset_code_2() * 0.0015 / 100.0
+        return offset_perc(self.get_offset_sign_2(), self.get_offset_code_2())
 
     def get_tx_current_bias_uA(self) -> float:
-        code = self.read_register_masked(0x07, 0x00FF)
-        multiplier = 2 ** ((code >> 6) * 2)
-        base = code & 0x003F
-        return multiplier * base * 0.5
+        return current_bias_uA(self._get_field(F_CURRENT_BIAS))
 
+    @micropython.native
     def get_rx1(self) -> float:
-        return read_adc_voltage(self._rx1) - read_adc_voltage(self._ref)
+        return (self._rx1.read_u16() - self._ref.read_u16()) * _ADC_SCALE
 
+    @micropython.native
     def get_rx2(self) -> float:
-        return read_adc_voltage(self._rx2) - read_adc_voltage(self._ref)
+        return (self._rx2.read_u16() - self._ref.read_u16()) * _ADC_SCALE
 
     def get_rx1_avg(self, nsamples: int = 10, delay_ms: int = 25) -> float:
-        rx = 0.0
-        for i in range(nsamples):
-            rx += self.get_rx1()
-            utime.sleep_ms(delay_ms)
-        rx /= nsamples
-        return rx
+        s = _sum_diff(self._rx1, self._ref, nsamples, delay_ms)
+        return s / nsamples * _ADC_SCALE
 
     def get_rx2_avg(self, nsamples: int = 10, delay_ms: int = 25) -> float:
-        rx = 0.0
-        for i in range(nsamples):
-            rx += self.get_rx2()
-            utime.sleep_ms(delay_ms)
-        rx /= nsamples
-        return rx
+        s = _sum_diff(self._rx2, self._ref, nsamples, delay_ms)
+        return s / nsamples * _ADC_SCALE
 
     def estimate_vtx_rms(self) -> float:
         vtx = 0.0
 
-        starting_offset_sign = self.get_offset_sign_1()
-        starting_offset = self.get_offset_code_1()
-        gain = self.get_master_gain()
-        if self.get_master_gain_boost():
-            gain *= 2
+        offset_addr = F_OFFSET_1[0]
+        reg_gain = self.read_register(F_MASTER_GAIN[0])
+        reg_offset = self.read_register(offset_addr)
+        gain = _decode_master_gain(reg_gain)
+        reg_offset_max = encode_field(reg_offset, F_OFFSET_CODE_1, 0x7F)
 
         # set offset to min (-0x7F)
-        self.set_offset_1(-1, 0x7F)
+        self.write_register(
+            offset_addr, encode_field(reg_offset_max, F_OFFSET_SIGN_1, 1)
+        )
+        utime.sleep_ms(VOLATILE_WAIT_MS)
         rx1_n = self.get_rx1_avg()
 
         # set offset to max (0x7F)
-        self.set_offset_1(1, 0x7F)
+        self.write_register(
+            offset_addr, encode_field(reg_offset_max, F_OFFSET_SIGN_1, 0)
+        )
+        utime.sleep_ms(VOLATILE_WAIT_MS)
         rx1_p = self.get_rx1_avg()
 
         # go back to original offset
-        self.set_offset_1(starting_offset_sign, starting_offset)
+        self.write_register(offset_addr, reg_offset)
+        utime.sleep_ms(VOLATILE_WAIT_MS)
 
         # rx1_p = gain * (v + op*Vtx_rms)
         # rx1_n = gain * (v + on*Vtx_rms)
         # rx1_p - rx1_n = gain * (op - on) * Vtx_rms
         # -> Vtx_rms = (rx1_p - rx1_n) / (gain * (op - on))
 
-        on = -0x7F * 0.000015
-        op = 0x7F * 0.000015
+        on = -0x7F * _OFF_SCALE
+        op = 0x7F * _OFF_SCALE
         drx = rx1_p - rx1_n
 
         vtx = drx / (gain * (op - on))
@@ -6,28 +6,56 @@ from ips2550 import VDD_3V3, VDD_5V0, OM_SINGLE_ENDED, OM_DIFFERENTIAL
 IPS_ADDR = 24
 I2C_FREQ = 100_000
 
+CONFIG_FIELDS = (
+    ips2550.F_VDD,
+    ips2550.F_OUTPUT_MODE,
+    ips2550.F_AUTOMATIC_GAIN_CONTROL,
+    ips2550.F_MASTER_GAIN,
+    ips2550.F_MASTER_GAIN_BOOST,
+    ips2550.F_FINE_GAIN_1,
+    ips2550.F_FINE_GAIN_2,
+    ips2550.F_OFFSET_1,
+    ips2550.F_OFFSET_2,
+    ips2550.F_CURRENT_BIAS,
+    ips2550.F_TX_FREQUENCY,
+)
+
+
 def print_current_config(ips: ips2550.IPS):
-    print(f"Supply Voltage            {3.3 if ips.get_vdd() == ips2550.VDD_3V3 else 5.0} V")
-    print(f"Output Mode               {"Differential" if ips.get_output_mode() == ips2550.OM_DIFFERENTIAL else "Single Ended"}")
-    print(f"Automatic Gain Control    {ips.get_automatic_gain_control()}")
+    regs = ips.snapshot({field[0] for field in CONFIG_FIELDS})
+
+    def field(f):
+        return ips2550.decode_field(regs[f[0]], f)
+
+    master_gain_code = field(ips2550.F_MASTER_GAIN)
+    fine_gain_1_code = field(ips2550.F_FINE_GAIN_1)
+    fine_gain_2_code = field(ips2550.F_FINE_GAIN_2)
+    offset_sign_1 = 1 if field(ips2550.F_OFFSET_SIGN_1) == 0 else -1
+    offset_sign_2 = 1 if field(ips2550.F_OFFSET_SIGN_2) == 0 else -1
+    offset_code_1 = field(ips2550.F_OFFSET_CODE_1)
+    offset_code_2 = field(ips2550.F_OFFSET_CODE_2)
+
+    print(f"Supply Voltage            {3.3 if field(ips2550.F_VDD) == ips2550.VDD_3V3 else 5.0} V")
+    print(f"Output Mode               {"Differential" if field(ips2550.F_OUTPUT_MODE) == ips2550.OM_DIFFERENTIAL else "Single Ended"}")
+    print(f"Automatic Gain Control    {field(ips2550.F_AUTOMATIC_GAIN_CONTROL) == 0}")
     print(
-        f"Master Gain Code          {ips.get_master_gain_code()} ({ips.get_master_gain()}x)"
+        f"Master Gain Code          {master_gain_code} ({ips2550.GAIN_FACTORS[master_gain_code]}x)"
     )
-    print(f"Master Gain Boost (2x)    {ips.get_master_gain_boost()}")
+    print(f"Master Gain Boost (2x)    {field(ips2550.F_MASTER_GAIN_BOOST) == 1}")
     print(
-        f"Fine Gain 1               {ips.get_fine_gain_1_code()} ({ips.get_fine_gain_1()}x)"
+        f"Fine Gain 1               {fine_gain_1_code} ({ips2550.fine_gain(fine_gain_1_code)}x)"
     )
     print(
-        f"Fine Gain 2               {ips.get_fine_gain_2_code()} ({ips.get_fine_gain_2()}x)"
+        f"Fine Gain 2               {fine_gain_2_code} ({ips2550.fine_gain(fine_gain_2_code)}x)"
     )
     print(
-        f"Offset 1                  {ips.get_offset_sign_1() * ips.get_offset_code_1()} ({ips.get_offset_1_perc()}*Vtx)"
+        f"Offset 1                  {offset_sign_1 * offset_code_1} ({ips2550.offset_perc(offset_sign_1, offset_code_1)}*Vtx)"
     )
     print(
-        f"Offset 2                  {ips.get_offset_sign_2() * ips.get_offset_code_2()} ({ips.get_offset_2_perc()}*Vtx)"
+        f"Offset 2                  {offset_sign_2 * offset_code_2} ({ips2550.offset_perc(offset_sign_2, offset_code_2)}*Vtx)"
     )
-    print(f"TX Current Bias           {ips.get_tx_current_bias_uA()} uA")
-    print(f"TX Frequency              {ips.get_tx_frequency()/1e6:0.2f} MHz")
+    print(f"TX Current Bias           {ips2550.current_bias_uA(field(ips2550.F_CURRENT_BIAS))} uA")
+    print(f"TX Frequency              {ips2550.tx_frequency(field(ips2550.F_TX_FREQUENCY))/1e6:0.2f} MHz")
 
 
 ips = ips2550.IPS(